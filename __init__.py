@@ -2,6 +2,7 @@ from .nodes.download_image_from_url import DownloadImageFromURL
 from .nodes.save_text_file import SaveTextFile
 from .nodes.get_file_path import GetFilePath
 from .nodes.groq_api_llm import GroqAPILLM
+from .nodes.groq_api_llm_batch import GroqAPILLMBatch
 from .nodes.groq_api_vlm import GroqAPIVLM
 from .nodes.groq_api_alm_transcribe import GroqAPIALMTranscribe
 from .nodes.tiktoken_tokenizer import TiktokenTokenizer
@@ -15,6 +16,7 @@ NODE_CLASS_MAPPINGS = {
     "💾 Save Text File With Path": SaveTextFile,
     "🖼️ Download Image from URL": DownloadImageFromURL,
     "✨💬 Groq LLM API": GroqAPILLM,
+    "✨💬 Groq LLM API - Batch": GroqAPILLMBatch,
     "✨📷 Groq VLM API": GroqAPIVLM,
     "✨📝 Groq ALM API - Transcribe": GroqAPIALMTranscribe,
     "🔠 Tiktoken Tokenizer Info": TiktokenTokenizer,
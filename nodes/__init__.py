@@ -3,6 +3,7 @@ from .generate_negative_prompt import GenerateNegativePrompt
 from .save_text_file import SaveTextFile
 from .get_file_path import GetFilePath
 from .groq_api_llm import GroqAPILLM
+from .groq_api_llm_batch import GroqAPILLMBatch
 from .groq_api_vlm import GroqAPIVLM
 from .groq_api_alm_transcribe import GroqAPIALMTranscribe
 from .tiktoken_tokenizer import TiktokenTokenizer
@@ -14,6 +15,7 @@ __all__ = [
     "SaveTextFile",
     "GetFilePath",
     "GroqAPILLM",
+    "GroqAPILLMBatch",
     "GroqAPIVLM",
     "GroqAPIALMTranscribe",
     "TiktokenTokenizer",
@@ -1,18 +1,10 @@
-import os
-import json
-import random
-import numpy as np
-import torch
-from colorama import init, Fore, Style
-from configparser import ConfigParser
-from groq import Groq
+from .groq_base import GroqBase
+from ..utils.log_utils import get_logger
 
-from ..utils.api_utils import make_api_request, load_prompt_options, get_prompt_content
+logger = get_logger(__name__)
 
-init()  # Initialize colorama
-
-class GroqAPILLM:
-    DEFAULT_PROMPT = "Use [system_message] and [user_input]"
+class GroqAPILLM(GroqBase):
+    PROMPT_FILES = ['DefaultPrompts.json', 'UserPrompts.json']
     
     LLM_MODELS = [
         "llama-3.1-8b-instant",
@@ -27,37 +19,15 @@ class GroqAPILLM:
         "gemma2-9b-it",
         "llama-3.2-1b-preview",
         "llama-3.2-3b-preview",
-        "llama-3.2-90b-vision-preview,"
+        "llama-3.2-90b-vision-preview",
     ]
     
-    def __init__(self):
-        current_directory = os.path.dirname(os.path.realpath(__file__))
-        groq_directory = os.path.join(current_directory, 'groq')
-        config_path = os.path.join(groq_directory, 'GroqConfig.ini')
-        self.config = ConfigParser()
-        self.config.read(config_path)
-        self.api_key = self.config.get('API', 'key')
-        self.client = Groq(api_key=self.api_key)
-        
-        # Load prompt options
-        prompt_files = [
-            os.path.join(groq_directory, 'DefaultPrompts.json'),
-            os.path.join(groq_directory, 'UserPrompts.json')
-        ]
-        self.prompt_options = load_prompt_options(prompt_files)
-    
     @classmethod
-    def INPUT_TYPES(cls):
+    def build_input_types(cls):
         try:
-            current_directory = os.path.dirname(os.path.realpath(__file__))
-            groq_directory = os.path.join(current_directory, 'groq')
-            prompt_files = [
-                os.path.join(groq_directory, 'DefaultPrompts.json'),
-                os.path.join(groq_directory, 'UserPrompts.json')
-            ]
-            prompt_options = load_prompt_options(prompt_files)
+            prompt_options = cls.load_prompt_options()
         except Exception as e:
-            print(Fore.RED + f"Failed to load prompt options: {e}" + Style.RESET_ALL)
+            logger.error("Failed to load prompt options: %s", e)
             prompt_options = {}
     
         return {
@@ -73,6 +43,9 @@ class GroqAPILLM:
                 "max_retries": ("INT", {"default": 2, "min": 1, "max": 10, "step": 1, "tooltip": "Maximum number of retries in case of request failure."}),
                 "stop": ("STRING", {"default": "", "tooltip": "Stop generation when the specified sequence is encountered."}),
                 "json_mode": ("BOOLEAN", {"default": False, "tooltip": "Enable JSON mode for structured output.\n\nIMPORTANT: Requires you to use the word 'JSON' in the prompt."}),
+            },
+            "optional": {
+                "stream": ("BOOLEAN", {"default": False, "tooltip": "Stream the response from the API instead of receiving it in one piece.\n\nReduces memory use for very long responses. The output is the same complete text."}),
             }
         }
     
@@ -84,38 +57,32 @@ class GroqAPILLM:
     CATEGORY = "⚡ MNeMiC Nodes"
     DESCRIPTION = "Uses Groq API to generate text from language models."
     
-    def process_completion_request(self, model, preset, system_message, user_input, temperature, max_tokens, top_p, seed, max_retries, stop, json_mode):
-        # Set the seed for reproducibility
-        torch.manual_seed(seed)
-        np.random.seed(seed)
-        random.seed(seed)
-    
-        if preset == self.DEFAULT_PROMPT:
-            system_message = system_message
-        else:
-            system_message = get_prompt_content(self.prompt_options, preset)
-    
-        url = 'https://api.groq.com/openai/v1/chat/completions'
-        headers = {'Authorization': f'Bearer {self.api_key}'}
+    def build_completion_data(self, model, preset, system_message, user_input, temperature, max_tokens, top_p, seed, stop):
+        system_message = self.resolve_system_message(preset, system_message)
         
         messages = [
             {"role": "system", "content": system_message},
             {"role": "user", "content": user_input}
         ]
-       
-        data = {
-            'model': model,
-            'messages': messages,
-            'temperature': temperature,
-            'max_tokens': max_tokens,
-            'top_p': top_p,
-            'seed': seed
-        }
         
-        if stop:  # Only add stop if it's not empty
-            data['stop'] = stop
+        return self.build_request_data(model, messages, temperature, max_tokens, top_p, seed, stop)
+    
+    def process_completion_request(self, model, preset, system_message, user_input, temperature, max_tokens, top_p, seed, max_retries, stop, json_mode, stream=False):
+        if preset == self.DEFAULT_PROMPT and not system_message.strip() and not user_input.strip():
+            logger.error("Both system_message and user_input are empty.")
+            return "Both system_message and user_input are empty.", False, "400 Bad Request"
+        
+        data = self.build_completion_data(model, preset, system_message, user_input, temperature, max_tokens, top_p, seed, stop)
         
-        print(f"Sending request to {url} with data: {json.dumps(data, indent=4)} and headers: {headers}")
+        logger.debug("Sending request to %s with data: %s", self.API_URL, data)
         
-        assistant_message, success, status_code = make_api_request(data, headers, url, max_retries)
+        assistant_message, success, status_code = self._post_with_retry(data, max_retries, stream=stream)
         return assistant_message, success, status_code
+    
+    def process_completion_batch(self, list_of_inputs, max_retries=2):
+        # Each entry holds the build_completion_data arguments for one request; all requests are sent concurrently
+        payloads = [self.build_completion_data(**inputs) for inputs in list_of_inputs]
+        
+        logger.info("Sending %d concurrent requests to %s", len(payloads), self.API_URL)
+        
+        return self._post_batch_with_retry(payloads, max_retries)
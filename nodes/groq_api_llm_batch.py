@@ -0,0 +1,47 @@
+from .groq_api_llm import GroqAPILLM
+
+class GroqAPILLMBatch(GroqAPILLM):
+    @classmethod
+    def build_input_types(cls):
+        input_types = super().build_input_types()
+
+        # Same inputs as the LLM node, but with one prompt per line instead of a single user input
+        required = {}
+        for name, value in input_types["required"].items():
+            if name == "user_input":
+                required["user_inputs"] = ("STRING", {"multiline": True, "default": "", "tooltip": "One prompt per line. Each line is sent as a separate request, and all requests run concurrently."})
+            else:
+                required[name] = value
+
+        return {"required": required}
+
+    RETURN_TYPES = ("STRING", "BOOLEAN", "STRING")
+    RETURN_NAMES = ("api_responses", "success", "status_codes")
+    OUTPUT_IS_LIST = (True, True, True)
+    OUTPUT_TOOLTIPS = ("The API responses, one for each line of user_inputs", "Whether each request was successful", "The status code of each request")
+    FUNCTION = "process_batch"
+    DESCRIPTION = "Uses Groq API to generate text for several prompts at once."
+
+    def process_batch(self, model, preset, system_message, user_inputs, temperature, max_tokens, top_p, seed, max_retries, stop, json_mode):
+        prompts = [line.strip() for line in user_inputs.splitlines() if line.strip()]
+        if not prompts:
+            return ["No user inputs provided."], [False], ["400 Bad Request"]
+
+        list_of_inputs = [
+            {
+                'model': model,
+                'preset': preset,
+                'system_message': system_message,
+                'user_input': prompt,
+                'temperature': temperature,
+                'max_tokens': max_tokens,
+                'top_p': top_p,
+                'seed': seed,
+                'stop': stop,
+            }
+            for prompt in prompts
+        ]
+
+        results = self.process_completion_batch(list_of_inputs, max_retries)
+        api_responses, success, status_codes = (list(values) for values in zip(*results))
+        return api_responses, success, status_codes
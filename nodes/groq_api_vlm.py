@@ -1,19 +1,13 @@
-import os
-import json
-import random
-import numpy as np
 import torch
-from colorama import init, Fore, Style
-from configparser import ConfigParser
-from groq import Groq
 
-from ..utils.api_utils import make_api_request, load_prompt_options, get_prompt_content
-from ..utils.image_utils import encode_image, tensor_to_pil
+from .groq_base import GroqBase
+from ..utils.image_utils import tensor_to_base64
+from ..utils.log_utils import get_logger
 
-init()  # Initialize colorama
+logger = get_logger(__name__)
 
-class GroqAPIVLM:
-    DEFAULT_PROMPT = "Use [system_message] and [user_input]"
+class GroqAPIVLM(GroqBase):
+    PROMPT_FILES = ['DefaultPrompts_VLM.json', 'UserPrompts_VLM.json']
     
     VLM_MODELS = [
         "llava-v1.5-7b-4096-preview",
@@ -21,34 +15,12 @@ class GroqAPIVLM:
         "llama-3.2-90b-vision-preview",
     ]
     
-    def __init__(self):
-        current_directory = os.path.dirname(os.path.realpath(__file__))
-        groq_directory = os.path.join(current_directory, 'groq')
-        config_path = os.path.join(groq_directory, 'GroqConfig.ini')
-        self.config = ConfigParser()
-        self.config.read(config_path)
-        self.api_key = self.config.get('API', 'key')
-        self.client = Groq(api_key=self.api_key)
-        
-        # Load prompt options
-        prompt_files = [
-            os.path.join(groq_directory, 'DefaultPrompts_VLM.json'),
-            os.path.join(groq_directory, 'UserPrompts_VLM.json')
-        ]
-        self.prompt_options = load_prompt_options(prompt_files)
-    
     @classmethod
-    def INPUT_TYPES(cls):
+    def build_input_types(cls):
         try:
-            current_directory = os.path.dirname(os.path.realpath(__file__))
-            groq_directory = os.path.join(current_directory, 'groq')
-            prompt_files = [
-                os.path.join(groq_directory, 'DefaultPrompts_VLM.json'),
-                os.path.join(groq_directory, 'UserPrompts_VLM.json')
-            ]
-            prompt_options = load_prompt_options(prompt_files)
+            prompt_options = cls.load_prompt_options()
         except Exception as e:
-            print(Fore.RED + f"Failed to load prompt options: {e}" + Style.RESET_ALL)
+            logger.error("Failed to load prompt options: %s", e)
             prompt_options = {}
     
         return {
@@ -65,6 +37,9 @@ class GroqAPIVLM:
                 "max_retries": ("INT", {"default": 2, "min": 1, "max": 10, "step": 1, "tooltip": "Maximum number of retries in case of failures."}),
                 "stop": ("STRING", {"default": "", "tooltip": "Stop generation when the specified sequence is encountered."}),
                 "json_mode": ("BOOLEAN", {"default": False, "tooltip": "Enable JSON mode for structured output.\n\nIMPORTANT: Requires you to use the word 'JSON' in the prompt."}),
+            },
+            "optional": {
+                "stream": ("BOOLEAN", {"default": False, "tooltip": "Stream the response from the API instead of receiving it in one piece.\n\nReduces memory use for very long responses. The output is the same complete text."}),
             }
         }
     
@@ -76,24 +51,12 @@ class GroqAPIVLM:
     CATEGORY = "⚡ MNeMiC Nodes"
     DESCRIPTION = "Uses Groq API for image processing."
     
-    def process_completion_request(self, model, image, temperature, max_tokens, top_p, seed, max_retries, stop, json_mode, preset="", system_message="", user_input=""):
-        # Set the seed for reproducibility
-        torch.manual_seed(seed)
-        np.random.seed(seed)
-        random.seed(seed)
-    
-        if preset == self.DEFAULT_PROMPT:
-            system_message = system_message
-        else:
-            system_message = get_prompt_content(self.prompt_options, preset)
-    
-        url = 'https://api.groq.com/openai/v1/chat/completions'
-        headers = {'Authorization': f'Bearer {self.api_key}'}
+    def process_completion_request(self, model, image, temperature, max_tokens, top_p, seed, max_retries, stop, json_mode, preset="", system_message="", user_input="", stream=False):
+        system_message = self.resolve_system_message(preset, system_message)
         
         if image is not None and isinstance(image, torch.Tensor):
-            # Process the image
-            image_pil = tensor_to_pil(image)
-            base64_image = encode_image(image_pil)
+            # Process the image, reusing the encoding if this exact image was sent recently
+            base64_image = tensor_to_base64(image)
             if base64_image:
                 combined_message = f"{system_message}\n{user_input}"
                 # Send one single message containing both text and image
@@ -109,25 +72,13 @@ class GroqAPIVLM:
                 }
                 messages = [image_content]
             else:
-                print(Fore.RED + "Failed to encode image." + Style.RESET_ALL)
+                logger.error("Failed to encode image.")
                 messages = []
         else:
-            print(Fore.RED + "Image is required for VLM models." + Style.RESET_ALL)
+            logger.error("Image is required for VLM models.")
             return "Image is required for VLM models.", False, "400 Bad Request"
        
-        data = {
-            'model': model,
-            'messages': messages,
-            'temperature': temperature,
-            'max_tokens': max_tokens,
-            'top_p': top_p,
-            'seed': seed
-        }
-        
-        if stop:  # Only add stop if it's not empty
-            data['stop'] = stop
-        
-        #print(f"Sending request to {url} with data: {json.dumps(data, indent=4)} and headers: {headers}")
+        data = self.build_request_data(model, messages, temperature, max_tokens, top_p, seed, stop)
         
-        assistant_message, success, status_code = make_api_request(data, headers, url, max_retries)
+        assistant_message, success, status_code = self._post_with_retry(data, max_retries, stream=stream)
         return assistant_message, success, status_code
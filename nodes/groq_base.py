@@ -0,0 +1,138 @@
+import os
+import copy
+from configparser import ConfigParser
+
+from ..utils.api_utils import make_api_request, make_batch_api_request, load_prompt_options, get_prompt_content
+from ..utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Shared config, prompt loading and request handling for the Groq chat completion nodes
+class GroqBase:
+    DEFAULT_PROMPT = "Use [system_message] and [user_input]"
+    API_URL = 'https://api.groq.com/openai/v1/chat/completions'
+    GROQ_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'groq')
+    CONFIG_PATH = os.path.join(GROQ_DIRECTORY, 'GroqConfig.ini')
+    PROMPT_FILES = []  # Prompt file names in the groq directory, set by each node
+    # Largest max_tokens (output tokens) each model accepts, higher requested values are clamped instead of rejected by the API
+    MODEL_MAX_OUTPUT_TOKENS = {
+        "llama-3.1-8b-instant": 8000,
+        "llama-3.1-70b-versatile": 8000,
+        "llama3-8b-8192": 8192,
+        "llama3-70b-8192": 8192,
+        "llama-guard-3-8b": 8192,
+        "llama3-groq-8b-8192-tool-use-preview": 8192,
+        "llama3-groq-70b-8192-tool-use-preview": 8192,
+        "mixtral-8x7b-32768": 32768,
+        "gemma-7b-it": 8192,
+        "gemma2-9b-it": 8192,
+        "llama-3.2-1b-preview": 8192,
+        "llama-3.2-3b-preview": 8192,
+        "llava-v1.5-7b-4096-preview": 4096,
+        "llama-3.2-11b-vision-preview": 8192,
+        "llama-3.2-90b-vision-preview": 8192,
+    }
+    MISSING_API_KEY_MESSAGE = "No Groq API key configured; edit groq/GroqConfig.ini"
+
+    # (config mtime, api key), shared by every Groq node instance and re-read only when the config changes
+    _api_key_cache = None
+
+    def __init__(self):
+        self.api_key = ""
+        self.headers = None
+        self.prompt_options = self.load_prompt_options()
+
+    @classmethod
+    def _get_api_key(cls):
+        # Returns an empty string when the config file or key is missing
+        try:
+            mtime = os.stat(cls.CONFIG_PATH).st_mtime_ns
+        except OSError:
+            return ""
+        if GroqBase._api_key_cache is not None and GroqBase._api_key_cache[0] == mtime:
+            return GroqBase._api_key_cache[1]
+        config = ConfigParser()
+        config.read(cls.CONFIG_PATH)
+        api_key = config.get('API', 'key', fallback="").strip()
+        GroqBase._api_key_cache = (mtime, api_key)
+        return api_key
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        # Rebuilt by the node's build_input_types only when a prompt file changes, otherwise menu refreshes reuse the cache.
+        # Read from cls.__dict__ so each node class keeps its own cache.
+        mtimes = cls.get_prompt_file_mtimes()
+        cached = cls.__dict__.get('_input_types_cache')
+        if cached is None or cached[0] != mtimes:
+            cached = (mtimes, cls.build_input_types())
+            cls._input_types_cache = cached
+        # Deep copy so callers that modify the result, down to option lists and dicts, can't corrupt the cache
+        return copy.deepcopy(cached[1])
+
+    @classmethod
+    def get_prompt_files(cls):
+        return [os.path.join(cls.GROQ_DIRECTORY, prompt_file) for prompt_file in cls.PROMPT_FILES]
+
+    @classmethod
+    def get_prompt_file_mtimes(cls):
+        mtimes = []
+        for prompt_file in cls.get_prompt_files():
+            try:
+                mtimes.append(os.stat(prompt_file).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    @classmethod
+    def load_prompt_options(cls):
+        return load_prompt_options(cls.get_prompt_files())
+
+    def resolve_system_message(self, preset, system_message):
+        if preset == self.DEFAULT_PROMPT:
+            return system_message
+        return get_prompt_content(self.prompt_options, preset)
+
+    def build_request_data(self, model, messages, temperature, max_tokens, top_p, seed, stop):
+        data = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': min(max_tokens, self.MODEL_MAX_OUTPUT_TOKENS.get(model, max_tokens)),
+            'top_p': top_p,
+            'seed': seed
+        }
+
+        if stop.strip():  # Only add stop if it's not empty, a whitespace-only stop is rejected by the API
+            data['stop'] = [stop]
+        elif stop:
+            logger.warning("Ignoring whitespace-only stop sequence %r, generation will not stop at it.", stop)
+
+        return data
+
+    def _get_headers(self):
+        # Checked on every request so config edits reach node instances ComfyUI keeps between runs.
+        # The mtime cache keeps this to one stat, and the header is only rebuilt when the key changes.
+        api_key = self._get_api_key()
+        if not api_key:
+            return None
+        if api_key != self.api_key:
+            self.api_key = api_key
+            self.headers = {'Authorization': f'Bearer {api_key}'}
+        return self.headers
+
+    def _missing_api_key_response(self):
+        # Without a key every attempt would be a guaranteed 401, so don't send anything
+        logger.error(self.MISSING_API_KEY_MESSAGE)
+        return self.MISSING_API_KEY_MESSAGE, False, "401 Unauthorized"
+
+    def _post_with_retry(self, data, max_retries, stream=False):
+        headers = self._get_headers()
+        if headers is None:
+            return self._missing_api_key_response()
+        return make_api_request(data, headers, self.API_URL, max_retries, stream=stream)
+
+    def _post_batch_with_retry(self, payloads, max_retries):
+        headers = self._get_headers()
+        if headers is None:
+            return [self._missing_api_key_response()] * len(payloads)
+        return make_batch_api_request(payloads, headers, self.API_URL, max_retries)
@@ -0,0 +1,28 @@
+import os
+import sys
+import types
+
+import httpx
+import pytest
+
+# Register the repo as a package without running its __init__.py, which loads every node (and torch/transformers)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for name, path in [('mnemic_nodes', ROOT), ('mnemic_nodes.nodes', os.path.join(ROOT, 'nodes')), ('mnemic_nodes.utils', os.path.join(ROOT, 'utils'))]:
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = [path]
+        sys.modules[name] = package
+
+@pytest.fixture
+def completion_transport(monkeypatch):
+    # Answers every chat completion with the request body, so results can be matched to their payloads
+    def handler(request):
+        return httpx.Response(200, json={'choices': [{'message': {'content': request.content.decode('utf-8')}}]})
+
+    async_client = httpx.AsyncClient
+
+    def make_client(**kwargs):
+        kwargs['transport'] = httpx.MockTransport(handler)
+        return async_client(**kwargs)
+
+    monkeypatch.setattr(httpx, 'AsyncClient', make_client)
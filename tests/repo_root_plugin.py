@@ -0,0 +1,12 @@
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def pytest_collect_directory(path, parent):
+    # The repo root is the ComfyUI node package, whose __init__.py loads every node (and torch/transformers).
+    # Collect it as a plain directory so pytest never imports it.
+    if str(path) == ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
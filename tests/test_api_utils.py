@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+
+from mnemic_nodes.utils import api_utils
+from mnemic_nodes.utils.api_utils import make_batch_api_request, json_loads
+
+URL = 'https://api.groq.com/openai/v1/chat/completions'
+
+def test_batch_request_returns_results_in_order(completion_transport):
+    payloads = [{'index': 0}, {'index': 1}, {'index': 2}]
+    results = make_batch_api_request(payloads, {}, URL, max_retries=1)
+    assert [json_loads(message) for message, _, _ in results] == payloads
+    assert all(success for _, success, _ in results)
+
+def test_batch_request_inside_running_event_loop(completion_transport):
+    async def call_from_loop():
+        return make_batch_api_request([{'index': 0}, {'index': 1}], {}, URL, max_retries=1)
+
+    results = asyncio.run(call_from_loop())
+    assert [json_loads(message) for message, _, _ in results] == [{'index': 0}, {'index': 1}]
+
+def test_batch_request_without_payloads():
+    assert make_batch_api_request([], {}, URL, max_retries=1) == []
+
+def test_batch_request_keeps_results_when_one_job_fails(monkeypatch):
+    def handler(request):
+        if json_loads(request.content)['index'] == 1:
+            raise httpx.DecodingError("corrupt response body", request=request)
+        return httpx.Response(200, json={'choices': [{'message': {'content': request.content.decode('utf-8')}}]})
+
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, 'AsyncClient', lambda **kwargs: async_client(transport=httpx.MockTransport(handler), **kwargs))
+    monkeypatch.setattr(api_utils, 'get_retry_delay', lambda *args, **kwargs: 0)
+
+    results = make_batch_api_request([{'index': 0}, {'index': 1}, {'index': 2}], {}, URL, max_retries=2)
+    assert [success for _, success, _ in results] == [True, False, True]
+    assert results[1] == ("Failed after all retries.", False, "Failed after all retries")
+
+def test_batch_request_maps_unexpected_exceptions_to_error_tuples(monkeypatch):
+    async def failing_request(client, data, headers, url, max_retries):
+        if data['index'] == 1:
+            raise ValueError("unexpected")
+        return "ok", True, "200 OK"
+
+    monkeypatch.setattr(api_utils, 'make_api_request_async', failing_request)
+    results = make_batch_api_request([{'index': 0}, {'index': 1}], {}, URL, max_retries=1)
+    assert results == [("ok", True, "200 OK"), ("ERROR", False, "Request failed: unexpected")]
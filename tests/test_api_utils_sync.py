@@ -0,0 +1,29 @@
+import httpx
+
+from mnemic_nodes.utils import api_utils
+
+URL = 'https://api.groq.com/openai/v1/chat/completions'
+
+def use_transport(monkeypatch, handler):
+    monkeypatch.setattr(api_utils, '_client', httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(api_utils.time, 'sleep', lambda seconds: None)
+
+def test_request_returns_error_tuple_when_body_cannot_be_decoded(monkeypatch):
+    def handler(request):
+        raise httpx.DecodingError("corrupt response body", request=request)
+
+    use_transport(monkeypatch, handler)
+    assert api_utils.make_api_request({}, {}, URL, max_retries=2) == ("Failed after all retries.", False, "Failed after all retries")
+
+def test_request_retries_after_decoding_error(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.DecodingError("corrupt response body", request=request)
+        return httpx.Response(200, json={'choices': [{'message': {'content': "hello"}}]})
+
+    use_transport(monkeypatch, handler)
+    assert api_utils.make_api_request({}, {}, URL, max_retries=2) == ("hello", True, "200 OK")
+    assert len(calls) == 2
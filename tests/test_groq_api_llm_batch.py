@@ -0,0 +1,26 @@
+import asyncio
+
+from mnemic_nodes.nodes.groq_api_llm_batch import GroqAPILLMBatch
+from mnemic_nodes.utils.api_utils import json_loads
+
+def run_batch(node, user_inputs):
+    return node.process_batch("llama-3.1-8b-instant", GroqAPILLMBatch.DEFAULT_PROMPT, "system", user_inputs, 0.85, 64, 1.0, 42, 1, "", False)
+
+def test_process_batch_sends_one_request_per_line(completion_transport):
+    api_responses, success, status_codes = run_batch(GroqAPILLMBatch(), "first\n\nsecond\n")
+    assert [json_loads(response)['messages'][1]['content'] for response in api_responses] == ["first", "second"]
+    assert success == [True, True]
+    assert status_codes == ["200 OK", "200 OK"]
+
+def test_process_batch_inside_running_event_loop(completion_transport):
+    node = GroqAPILLMBatch()
+
+    async def call_from_loop():
+        return run_batch(node, "first\nsecond")
+
+    api_responses, success, _ = asyncio.run(call_from_loop())
+    assert len(api_responses) == 2
+    assert success == [True, True]
+
+def test_process_batch_without_user_inputs():
+    assert run_batch(GroqAPILLMBatch(), "\n  \n") == (["No user inputs provided."], [False], ["400 Bad Request"])
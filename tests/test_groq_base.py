@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from mnemic_nodes.nodes import groq_base
+from mnemic_nodes.nodes.groq_base import GroqBase
+from mnemic_nodes.nodes.groq_api_llm import GroqAPILLM
+from mnemic_nodes.nodes.groq_api_llm_batch import GroqAPILLMBatch
+
+def test_input_types_are_not_shared_with_cache():
+    input_types = GroqAPILLM.INPUT_TYPES()
+    input_types["required"].pop("model")
+    input_types["extra"] = {}
+    input_types["required"]["preset"][0].append("Injected preset")
+    input_types["required"]["seed"][1]["default"] = 0
+    assert "model" in GroqAPILLM.INPUT_TYPES()["required"]
+    assert "extra" not in GroqAPILLM.INPUT_TYPES()
+    assert "Injected preset" not in GroqAPILLM.INPUT_TYPES()["required"]["preset"][0]
+    assert GroqAPILLM.INPUT_TYPES()["required"]["seed"][1]["default"] == 42
+
+def test_input_types_are_cached_per_node_class():
+    assert "user_input" in GroqAPILLM.INPUT_TYPES()["required"]
+    assert "user_inputs" in GroqAPILLMBatch.INPUT_TYPES()["required"]
+    assert "user_input" in GroqAPILLM.INPUT_TYPES()["required"]
+
+def write_config(path, key, mtime_ns):
+    path.write_text(f"[API]\nkey = {key}\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_config_edits_reach_existing_node_instances(tmp_path, monkeypatch):
+    config_path = tmp_path / "GroqConfig.ini"
+    write_config(config_path, "", 1_000_000_000)
+    monkeypatch.setattr(GroqBase, 'CONFIG_PATH', str(config_path))
+    monkeypatch.setattr(GroqBase, '_api_key_cache', None)
+
+    sent_headers = []
+    def fake_request(data, headers, url, max_retries, stream=False):
+        sent_headers.append(headers)
+        return "ok", True, "200 OK"
+    monkeypatch.setattr(groq_base, 'make_api_request', fake_request)
+
+    node = GroqAPILLM()
+    assert node._post_with_retry({}, 1) == (GroqBase.MISSING_API_KEY_MESSAGE, False, "401 Unauthorized")
+    assert sent_headers == []
+
+    write_config(config_path, "first-key", 2_000_000_000)
+    assert node._post_with_retry({}, 1) == ("ok", True, "200 OK")
+
+    write_config(config_path, "second-key", 3_000_000_000)
+    node._post_with_retry({}, 1)
+    assert [headers['Authorization'] for headers in sent_headers] == ["Bearer first-key", "Bearer second-key"]
+
+def test_whitespace_only_stop_is_dropped_with_warning(caplog):
+    groq_base.logger.addHandler(caplog.handler)
+    try:
+        data = GroqAPILLM().build_request_data("gemma2-9b-it", [], 0.85, 64, 1.0, 42, "\n")
+    finally:
+        groq_base.logger.removeHandler(caplog.handler)
+    assert 'stop' not in data
+    assert "Ignoring whitespace-only stop sequence '\\n'" in caplog.text
+
+def test_stop_is_sent_as_list():
+    data = GroqAPILLM().build_request_data("gemma2-9b-it", [], 0.85, 64, 1.0, 42, "END")
+    assert data['stop'] == ["END"]
+
+def test_every_llm_model_has_a_max_output_tokens_limit():
+    for model in GroqAPILLM.LLM_MODELS:
+        assert model in GroqBase.MODEL_MAX_OUTPUT_TOKENS, model
+
+def test_every_vlm_model_has_a_max_output_tokens_limit():
+    pytest.importorskip("torch")
+    from mnemic_nodes.nodes.groq_api_vlm import GroqAPIVLM
+    for model in GroqAPIVLM.VLM_MODELS:
+        assert model in GroqBase.MODEL_MAX_OUTPUT_TOKENS, model
+
+def test_max_tokens_is_clamped_to_model_limit():
+    node = GroqAPILLM()
+    assert node.build_request_data("llama-3.1-8b-instant", [], 0.85, 131072, 1.0, 42, "")['max_tokens'] == 8000
+    assert node.build_request_data("llama-3.1-8b-instant", [], 0.85, 1024, 1.0, 42, "")['max_tokens'] == 1024
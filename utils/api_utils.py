@@ -1,37 +1,208 @@
-import requests
+import os
+import asyncio
+import importlib.util
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 import json
 import time
+import random
 
-def make_api_request(data, headers, url, max_retries):
+from .log_utils import get_logger
+
+try:
+    import orjson  # Optional, faster JSON encoding/decoding for large payloads and responses
+except ImportError:
+    orjson = None
+
+logger = get_logger(__name__)
+
+# Rate limits and transient server errors are worth retrying, everything else fails immediately
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Maximum number of concurrent connections used by make_batch_api_request
+BATCH_MAX_CONNECTIONS = 16
+
+# Maximum number of connections kept by the shared client
+CLIENT_MAX_CONNECTIONS = 32
+
+REQUEST_TIMEOUT = httpx.Timeout(connect=5, read=120, write=30, pool=5)
+
+# Shared client so concurrent and repeated calls to api.groq.com reuse pooled connections,
+# multiplexed over a single HTTP/2 connection when h2 is installed
+_client = None
+
+def json_dumps(data):
+    return orjson.dumps(data) if orjson is not None else json.dumps(data).encode('utf-8')
+
+def json_loads(raw):
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def http2_available():
+    return importlib.util.find_spec('h2') is not None
+
+def get_client():
+    global _client
+    if _client is None:
+        # httpx advertises br/zstd in Accept-Encoding by itself when brotli/zstandard are installed
+        limits = httpx.Limits(max_connections=CLIENT_MAX_CONNECTIONS, max_keepalive_connections=CLIENT_MAX_CONNECTIONS)
+        _client = httpx.Client(http2=http2_available(), limits=limits, timeout=REQUEST_TIMEOUT, headers={'Content-Type': 'application/json'})
+    return _client
+
+def get_retry_delay(attempt, response=None, base=1.0, jitter=0.5, max_delay=30):
+    # Honor the server's Retry-After hint if it sent one, otherwise back off exponentially with jitter
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(max_delay, float(retry_after))
+            except ValueError:
+                pass
+    return min(max_delay, base * (2 ** attempt) * (1 + jitter * random.random()))
+
+def parse_completion_response(response_content):
+    try:
+        response_json = json_loads(response_content)
+        if 'choices' in response_json and response_json['choices']:
+            assistant_message = response_json['choices'][0]['message']['content']
+            logger.debug("Extracted message: %s", assistant_message)
+            return assistant_message, True, "200 OK"
+        else:
+            return "No valid response content found.", False, "200 OK but no content"
+    except Exception as e:
+        logger.error("Error parsing response: %s", e)
+        return "Error parsing JSON response.", False, "200 OK but failed to parse JSON"
+
+def parse_streamed_completion_response(response):
+    # Concatenate the delta content of each server-sent event until the [DONE] marker
+    chunks = []
+    try:
+        for line in response.iter_lines():
+            if not line.startswith('data:'):
+                continue
+            payload = line[len('data:'):].strip()
+            if payload == '[DONE]':
+                break
+            event = json_loads(payload)
+            if event.get('choices'):
+                content = event['choices'][0].get('delta', {}).get('content')
+                if content:
+                    chunks.append(content)
+    except Exception as e:
+        logger.error("Error parsing streamed response: %s", e)
+        return "Error parsing streamed response.", False, "200 OK but failed to parse stream"
+    finally:
+        response.close()
+
+    if not chunks:
+        return "No valid response content found.", False, "200 OK but no content"
+    assistant_message = ''.join(chunks)
+    logger.debug("Extracted message: %s", assistant_message)
+    return assistant_message, True, "200 OK"
+
+def make_api_request(data, headers, url, max_retries, stream=False):
+    client = get_client()
+    if stream:
+        data = {**data, 'stream': True}
     for attempt in range(max_retries):
-        response = requests.post(url, headers=headers, json=data)
-        print(f"Response status: {response.status_code}, Response body: {response.text}")
+        is_last_attempt = attempt == max_retries - 1
+        try:
+            request = client.build_request('POST', url, headers=headers, content=json_dumps(data))
+            response = client.send(request, stream=stream)
+            if stream and response.status_code != 200:
+                response.read()
+        except httpx.HTTPError as e:
+            # Connection problems, timeouts and undecodable (e.g. corrupt br/zstd) bodies are all retried
+            logger.warning("Request failed (attempt %d of %d): %s", attempt + 1, max_retries, e)
+            if not is_last_attempt:
+                time.sleep(get_retry_delay(attempt))
+            continue
+
+        if response.status_code == 200 and stream:
+            logger.info("Response status: %s, streaming response body", response.status_code)
+            return parse_streamed_completion_response(response)
+        logger.info("Response status: %s", response.status_code)
+        logger.debug("Response body: %s", response.text)
         if response.status_code == 200:
-            try:
-                response_json = json.loads(response.text)
-                if 'choices' in response_json and response_json['choices']:
-                    assistant_message = response_json['choices'][0]['message']['content']
-                    print(f"Extracted message: {assistant_message}")
-                    return assistant_message, True, "200 OK"
-                else:
-                    return "No valid response content found.", False, "200 OK but no content"
-            except Exception as e:
-                print(f"Error parsing response: {str(e)}")
-                return "Error parsing JSON response.", False, "200 OK but failed to parse JSON"
+            return parse_completion_response(response.content)
+        elif response.status_code in RETRYABLE_STATUS_CODES and not is_last_attempt:
+            time.sleep(get_retry_delay(attempt, response))
+        else:
+            # Non-retryable error, or the last retry also failed
+            return "ERROR", False, f"{response.status_code} {response.reason_phrase}"
+    return "Failed after all retries.", False, "Failed after all retries"
+
+async def make_api_request_async(client, data, headers, url, max_retries):
+    for attempt in range(max_retries):
+        is_last_attempt = attempt == max_retries - 1
+        try:
+            response = await client.post(url, headers=headers, content=json_dumps(data))
+        except httpx.HTTPError as e:
+            logger.warning("Request failed (attempt %d of %d): %s", attempt + 1, max_retries, e)
+            if not is_last_attempt:
+                await asyncio.sleep(get_retry_delay(attempt))
+            continue
+
+        logger.info("Response status: %s", response.status_code)
+        logger.debug("Response body: %s", response.text)
+        if response.status_code == 200:
+            return parse_completion_response(response.content)
+        elif response.status_code in RETRYABLE_STATUS_CODES and not is_last_attempt:
+            await asyncio.sleep(get_retry_delay(attempt, response))
         else:
-            return "ERROR", False, f"{response.status_code} {response.reason}"
-        time.sleep(2)
+            return "ERROR", False, f"{response.status_code} {response.reason_phrase}"
     return "Failed after all retries.", False, "Failed after all retries"
 
+async def _gather_api_requests(payloads, headers, url, max_retries, max_connections):
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(http2=http2_available(), limits=limits, timeout=REQUEST_TIMEOUT, headers={'Content-Type': 'application/json'}) as client:
+        results = await asyncio.gather(*[make_api_request_async(client, data, headers, url, max_retries) for data in payloads], return_exceptions=True)
+
+    # An unexpected failure in one job becomes that job's error tuple instead of discarding the whole batch
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            logger.error("Batch request %d failed: %s", index, result)
+            results[index] = ("ERROR", False, f"Request failed: {result}")
+    return results
+
+def make_batch_api_request(payloads, headers, url, max_retries, max_connections=BATCH_MAX_CONNECTIONS):
+    # Send all payloads concurrently and return one (message, success, status_code) tuple per payload, in order
+    if not payloads:
+        return []
+
+    def run_batch():
+        return list(asyncio.run(_gather_api_requests(payloads, headers, url, max_retries, max_connections)))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run_batch()
+
+    # asyncio.run can't be nested, so when called from a thread that already runs an event loop
+    # (e.g. ComfyUI's executor) the batch gets its own loop on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_batch).result()
+
+# Parsed prompt files, keyed by path and invalidated when the file's mtime changes
+_prompt_cache = {}
+
+def load_prompt_file(json_file):
+    mtime = os.stat(json_file).st_mtime_ns
+    cached = _prompt_cache.get(json_file)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(json_file, 'rb') as file:
+        prompts = json_loads(file.read())
+    parsed = {prompt['name']: prompt['content'] for prompt in prompts}
+    _prompt_cache[json_file] = (mtime, parsed)
+    return parsed
+
 def load_prompt_options(prompt_files):
     prompt_options = {}
     for json_file in prompt_files:
         try:
-            with open(json_file, 'r') as file:
-                prompts = json.load(file)
-                prompt_options.update({prompt['name']: prompt['content'] for prompt in prompts})
+            prompt_options.update(load_prompt_file(json_file))
         except Exception as e:
-            print(f"Failed to load prompts from {json_file}: {str(e)}")
+            logger.error("Failed to load prompts from %s: %s", json_file, e)
     return prompt_options
 
 def get_prompt_content(prompt_options, prompt_name):
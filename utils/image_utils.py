@@ -1,15 +1,24 @@
 import base64
+import hashlib
+from collections import OrderedDict
 from PIL import Image
-import numpy as np
 from io import BytesIO
 
-def encode_image(image_pil):
+from .log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Base64 JPEGs of recently sent images, keyed by a hash of the tensor contents
+_encoded_image_cache = OrderedDict()
+ENCODED_IMAGE_CACHE_SIZE = 32
+
+def encode_image(image_pil, quality=85):
     try:
         buffered = BytesIO()
-        image_pil.save(buffered, format="JPEG")
+        image_pil.save(buffered, format="JPEG", quality=quality)
         return base64.b64encode(buffered.getvalue()).decode('utf-8')
     except Exception as e:
-        print(f"Error encoding image: {e}")
+        logger.error("Error encoding image: %s", e)
         return None
 
 def tensor_to_pil(image_tensor):
@@ -20,12 +29,34 @@ def tensor_to_pil(image_tensor):
 
     # Ensure the tensor is in the form [H, W, C] (height, width, channels)
     if image_tensor.ndim == 3 and image_tensor.shape[2] == 3:  # Expecting RGB image with 3 channels
-        image_array = image_tensor.cpu().numpy()
-        image_array = (image_array * 255).astype(np.uint8)  # Convert from [0, 1] to [0, 255]
+        # Convert from [0, 1] to [0, 255] before leaving the device so only the uint8 data is copied
+        image_array = (image_tensor * 255).clamp(0, 255).to(torch.uint8).cpu().numpy()
         return Image.fromarray(image_array)
     else:
         raise TypeError(f"Unsupported image tensor shape: {image_tensor.shape}")
 
+def tensor_to_base64(image_tensor, max_size=1120, quality=80):
+    # Images larger than max_size are downscaled before encoding, the VLM resizes them anyway
+    image_bytes = image_tensor.detach().cpu().contiguous().numpy().tobytes()
+    hasher = hashlib.blake2b(image_bytes, digest_size=16)
+    hasher.update(str((tuple(image_tensor.shape), max_size, quality)).encode('utf-8'))
+    key = hasher.digest()
+
+    base64_image = _encoded_image_cache.get(key)
+    if base64_image is not None:
+        _encoded_image_cache.move_to_end(key)
+        return base64_image
+
+    image_pil = tensor_to_pil(image_tensor)
+    if max_size:
+        image_pil.thumbnail((max_size, max_size), Image.LANCZOS)
+    base64_image = encode_image(image_pil, quality=quality)
+    if base64_image:
+        _encoded_image_cache[key] = base64_image
+        if len(_encoded_image_cache) > ENCODED_IMAGE_CACHE_SIZE:
+            _encoded_image_cache.popitem(last=False)
+    return base64_image
+
 def save_image(image_pil, filename):
     try:
         image_pil.save(filename)
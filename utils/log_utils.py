@@ -0,0 +1,29 @@
+import logging
+import sys
+from colorama import init, Fore, Style
+
+init()  # Initialize colorama
+
+class ColorFormatter(logging.Formatter):
+    # Errors are shown in red, but only when writing to an interactive terminal
+    def __init__(self, stream):
+        super().__init__('%(message)s')
+        self.use_color = hasattr(stream, 'isatty') and stream.isatty()
+
+    def format(self, record):
+        message = super().format(record)
+        if self.use_color and record.levelno >= logging.ERROR:
+            return Fore.RED + message + Style.RESET_ALL
+        return message
+
+# Single handler on the package logger, every module logs through a child of it
+_package_logger = logging.getLogger(__package__.rpartition('.')[0] or __package__)
+if not _package_logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(ColorFormatter(_handler.stream))
+    _package_logger.addHandler(_handler)
+    _package_logger.setLevel(logging.INFO)
+    _package_logger.propagate = False
+
+def get_logger(name):
+    return logging.getLogger(name)